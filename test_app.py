@@ -13,7 +13,7 @@ Run with: pytest test_app.py -v
 
 import pytest
 from fastapi.testclient import TestClient
-from app import app, incidents, id_counter, id_lock
+from app import app, reset_test_data
 
 # Create test client
 client = TestClient(app)
@@ -22,18 +22,6 @@ client = TestClient(app)
 VALID_TOKEN = "demo-token-123"  # Demo token - do not use in production
 INVALID_TOKEN = "invalid-token"
 
-def reset_test_data():
-    """Reset incidents data and ID counter for consistent testing"""
-    global incidents
-    incidents.clear()
-    incidents.extend([
-        {"id": 1, "title": "Phishing Email Campaign Detected", "status": "open", "severity": "high"},
-        {"id": 2, "title": "Malware Detected on Endpoint", "status": "closed", "severity": "medium"},
-        {"id": 3, "title": "Suspicious Login from Foreign IP", "status": "under investigation", "severity": "low"},
-    ])
-    with id_lock:
-        id_counter["value"] = 3
-
 @pytest.fixture(autouse=True)
 def setup_test():
     """Setup before each test"""
@@ -318,24 +306,26 @@ class TestEdgeCases:
         assert len(data["incidents"]) == 1
     
     def test_large_per_page_limit(self):
-        """Test that per_page is capped at 100"""
+        """Test that per_page above 100 is rejected at validation"""
         response = client.get("/incidents?per_page=1000")
+        assert response.status_code == 422
+
+    def test_max_per_page(self):
+        """Test that per_page=100 (the maximum) is accepted"""
+        response = client.get("/incidents?per_page=100")
         assert response.status_code == 200
         data = response.json()
-        assert data["per_page"] == 100  # Should be capped
-    
+        assert data["per_page"] == 100
+
     def test_zero_page(self):
-        """Test behavior with page=0"""
+        """Test that page=0 is rejected at validation"""
         response = client.get("/incidents?page=0")
-        assert response.status_code == 200
-        data = response.json()
-        # Should handle gracefully (though results may vary)
-    
+        assert response.status_code == 422
+
     def test_negative_page(self):
-        """Test behavior with negative page number"""
+        """Test that negative page numbers are rejected at validation"""
         response = client.get("/incidents?page=-1")
-        assert response.status_code == 200
-        # Should handle gracefully
+        assert response.status_code == 422
 
 # Performance and concurrency tests
 class TestConcurrency: